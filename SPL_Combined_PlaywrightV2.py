@@ -1,62 +1,173 @@
-import requests
-import pandas as pd
-import time
+import argparse
+import asyncio
+import csv
+import os
 import re
-from datetime import datetime
-from playwright.sync_api import sync_playwright
+import threading
+import time
+from datetime import datetime, timezone
+from urllib.parse import quote_plus
+
+# Dépendances tierces
+import diskcache
+import httpx
+import openpyxl
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from selectolax.parser import HTMLParser
+
+# Durée de validité des caches disque (secondes) : les prix bougent peu dans la journée
+CACHE_EXPIRE = 3600
+
+# -------------------------------
+# Client HTTP/2 Steam partagé (une connexion multiplexée + cache disque)
+# -------------------------------
+STEAM_HEADERS = {"User-Agent": "Mozilla/5.0"}
+STEAM = httpx.Client(
+    headers=STEAM_HEADERS, timeout=15,
+    transport=httpx.HTTPTransport(http2=True, retries=2,
+                                  limits=httpx.Limits(max_keepalive_connections=10)),
+)
+
+# Cache des réponses Steam (pages du classement, prix par appid)
+STEAM_CACHE = diskcache.Cache(".steam_cache")
+
+# -------------------------------
+# Limitation de débit par hôte (appels synchrones et coroutines)
+# -------------------------------
+class RateLimiter:
+    """Espace les appels vers un même hôte d'au moins 1/rps seconde."""
+
+    def __init__(self, rps):
+        self.interval = 1 / rps
+        self.lock = threading.Lock()
+        self.next = 0
+
+    def _reserve(self):
+        with self.lock:
+            now = time.monotonic()
+            delay = max(0, self.next - now)
+            self.next = max(now, self.next) + self.interval
+        return delay
+
+    def wait(self):
+        time.sleep(self._reserve())
+
+    async def wait_async(self):
+        await asyncio.sleep(self._reserve())
+
+STEAM_LIMITER = RateLimiter(5)
+GOCLECD_LIMITER = RateLimiter(2)
+
+# Regex de parse_price_text, compilées une seule fois
+_PRICE_STRIP_RE = re.compile(r"[^\d,.\s]")
+_PRICE_NUM_RE = re.compile(r"\d+(\.\d{1,2})?")
+
+# Symboles de marque et suffixes "... Deluxe/Gold/Ultimate ... Edition" retirés pour la recherche GoCleCD
+_NAME_NOISE_RE = re.compile(r"[™®©]|\s*[:\-–]?\s*\b(?:Deluxe|Gold|Ultimate)\b[^:]*Edition$")
+
+# Cache des résultats GoCleCD, indexé par nom de jeu normalisé
+GOCLECD_CACHE = diskcache.Cache(".goclecd_cache")
+
+# Nombre de contextes GoCleCD (onglets en parallèle) partagés par un seul navigateur
+MAX_WORKERS = 8
+
+# Ressources inutiles pour lire le prix : bloquées côté navigateur
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media", "stylesheet"}
+BLOCKED_HOSTS = ("google-analytics", "googletagmanager", "doubleclick", "hotjar")
 
 # -------------------------------
 # Steam
 # -------------------------------
-def get_steam_top_sellers(max_games=500):
+def normalize_game_name(name):
+    """Nom de recherche GoCleCD : retire ™/®/© et les suffixes d'édition (Deluxe, Gold, Ultimate)"""
+    return _NAME_NOISE_RE.sub("", name).strip()
+
+def get_steam_top_sellers(max_games=500, use_cache=True):
     """Récupère les jeux les plus vendus sur Steam"""
     games_list = []
     page = 0
     games_per_page = 50
-    headers = {"User-Agent": "Mozilla/5.0"}
 
     while len(games_list) < max_games:
         start = page * games_per_page
-        url = f"https://store.steampowered.com/search/?filter=topsellers&start={start}&count={games_per_page}"
-        response = requests.get(url, headers=headers, timeout=15)
-        if response.status_code != 200:
-            break
+        # Endpoint JSON de la recherche : seul le fragment HTML des résultats est renvoyé
+        url = (f"https://store.steampowered.com/search/results/?filter=topsellers"
+               f"&start={start}&count={games_per_page}&json=1&infinite=1")
+        results_html = STEAM_CACHE.get(url) if use_cache else None
+        if results_html is None:
+            STEAM_LIMITER.wait()
+            response = STEAM.get(url)
+            if response.status_code != 200:
+                break
+            try:
+                results_html = response.json().get("results_html", "")
+            except ValueError:
+                break
+            if use_cache:
+                STEAM_CACHE.set(url, results_html, expire=CACHE_EXPIRE)
 
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(response.text, "html.parser")
-        search_results = soup.find_all("a", {"class": "search_result_row"})
+        # selectolax (moteur C) : bien plus rapide que BeautifulSoup + html.parser
+        tree = HTMLParser(results_html)
+        search_results = tree.css("a.search_result_row")
         if not search_results:
             break
 
         for result in search_results:
-            data_appid = result.get("data-ds-appid")
+            data_appid = result.attributes.get("data-ds-appid")
             if data_appid:
-                name_tag = result.find("span", {"class": "title"})
-                name = name_tag.text.strip() if name_tag else "N/A"
+                name_tag = result.css_first("span.title")
+                name = name_tag.text(strip=True) if name_tag else "N/A"
                 games_list.append((int(data_appid), name))
                 if len(games_list) >= max_games:
                     break
         page += 1
-        time.sleep(1.0)
 
     return games_list
 
 
-def get_steam_price(app_id, country="fr"):
-    """Récupère le prix sur Steam"""
-    url = f"https://store.steampowered.com/api/appdetails?appids={app_id}&cc={country}&l=fr"
-    try:
-        response = requests.get(url, timeout=10)
-        data = response.json()
-        if data[str(app_id)]["success"]:
-            price_info = data[str(app_id)]["data"].get("price_overview")
-            if price_info:
-                return price_info["final"] / 100
-            else:
-                return 0
-    except Exception:
-        return None
-    return None
+async def fetch_appdetails_chunks(chunks, country="fr"):
+    """Lance les requêtes appdetails en parallèle, multiplexées sur une connexion HTTP/2"""
+    async with httpx.AsyncClient(http2=True, headers=STEAM_HEADERS, timeout=10) as client:
+        async def fetch(chunk):
+            # Plusieurs appids par requête : accepté uniquement avec filters=price_overview
+            url = (f"https://store.steampowered.com/api/appdetails?appids={','.join(map(str, chunk))}"
+                   f"&cc={country}&l=fr&filters=price_overview")
+            try:
+                await STEAM_LIMITER.wait_async()
+                response = await client.get(url)
+                return response.json() or {}
+            except Exception:
+                return {}
+
+        return await asyncio.gather(*(fetch(chunk) for chunk in chunks))
+
+
+async def get_steam_prices_bulk(app_ids, country="fr", chunk_size=100, use_cache=True):
+    """Récupère les prix Steam par lots d'appids ({appid: prix ou None})"""
+    prices = {}
+    missing = []
+    for app_id in app_ids:
+        cached = STEAM_CACHE.get(f"price:{country}:{app_id}") if use_cache else None
+        if cached is not None:
+            prices[app_id] = cached
+        else:
+            missing.append(app_id)
+
+    chunks = [missing[i:i + chunk_size] for i in range(0, len(missing), chunk_size)]
+    if not chunks:
+        return prices
+    for chunk, data in zip(chunks, await fetch_appdetails_chunks(chunks, country)):
+        for app_id in chunk:
+            entry = data.get(str(app_id))
+            if not entry or not entry.get("success"):
+                prices[app_id] = None
+                continue
+            # Jeu gratuit : Steam renvoie "data": [] au lieu d'un objet
+            price_info = (entry.get("data") or {}).get("price_overview")
+            prices[app_id] = price_info["final"] / 100 if price_info else 0
+            if use_cache:
+                STEAM_CACHE.set(f"price:{country}:{app_id}", prices[app_id], expire=CACHE_EXPIRE)
+    return prices
 
 # -------------------------------
 # GoCleCD avec Playwright (sélection 1er lien via XPath)
@@ -65,107 +176,129 @@ def parse_price_text(text):
     """Nettoie une chaîne de prix et retourne un float en euros"""
     if not text:
         return None
-    cleaned = re.sub(r"[^\d,.\s]", "", text).strip().replace(",", ".")
-    m = re.search(r"\d+(\.\d{1,2})?", cleaned)
+    # Cas courant ("12,99 €", "5") : conversion directe sans passer par les regex
+    candidate = text.strip().rstrip("€").strip().replace(",", ".")
+    if candidate.isascii():
+        whole, _, frac = candidate.partition(".")
+        if whole.isdigit() and (not frac or (frac.isdigit() and len(frac) <= 2)):
+            return float(candidate)
+    cleaned = _PRICE_STRIP_RE.sub("", text).strip().replace(",", ".")
+    m = _PRICE_NUM_RE.search(cleaned)
     return float(m.group(0)) if m else None
 
-def accept_cookies_if_present(page):
-    selectors = [
-        "button#onetrust-accept-btn-handler",
-        "button:has-text('Accepter')",
-        "button:has-text('Accept')",
-        "text=Ok",  # certains sites FR ont juste "Ok"
-    ]
-    for sel in selectors:
-        try:
-            el = page.query_selector(sel)
-            if el:
-                el.click(timeout=1000)
-                break
-        except Exception:
-            pass
-
-def wait_for_offer_rows(page, timeout_ms=20000):
+async def wait_for_offer_rows(page, timeout_ms=20000):
     # Attacher le tableau
-    page.wait_for_selector("table#offerTable", state="attached", timeout=timeout_ms)
+    await page.wait_for_selector("table#offerTable", state="attached", timeout=timeout_ms)
     # Attacher au moins une ligne
-    page.wait_for_selector("table#offerTable tbody tr", state="attached", timeout=timeout_ms)
+    await page.wait_for_selector("table#offerTable tbody tr", state="attached", timeout=timeout_ms)
     # Scroll pour déclencher lazy-render si nécessaire
-    page.evaluate("window.scrollTo(0, document.body.scrollHeight/3)")
+    await page.evaluate("window.scrollTo(0, document.body.scrollHeight/3)")
     # Attendre que la cellule prix soit visible
-    price_span = page.wait_for_selector("table#offerTable tbody tr td.offers-price a span", state="visible", timeout=timeout_ms)
+    price_span = await page.wait_for_selector("table#offerTable tbody tr td.offers-price a span", state="visible", timeout=timeout_ms)
     return price_span
 
-def extract_first_offer(page):
+# Lecture de la première ligne de #offerTable (marchand facultatif)
+FIRST_OFFER_JS = """() => {
+    const row = document.querySelector('table#offerTable tbody tr');
+    if (!row) return null;
+    const p = row.querySelector('td.offers-price a span');
+    const m = row.querySelector('td.offers-merchant a');
+    return {price: p?.textContent?.trim() ?? null, merchant: m?.textContent?.trim() ?? 'N/A'};
+}"""
+
+async def extract_first_offer(page):
     """Extrait prix + marchand sur la première ligne du tableau des offres."""
     try:
-        wait_for_offer_rows(page, timeout_ms=25000)
+        await wait_for_offer_rows(page, timeout_ms=25000)
     except Exception:
         # fallback: donner un peu de temps et retenter une fois
-        page.wait_for_timeout(1000)
+        await page.wait_for_timeout(1000)
         try:
-            wait_for_offer_rows(page, timeout_ms=25000)
+            await wait_for_offer_rows(page, timeout_ms=25000)
         except Exception:
             return None, None
 
-    # Prix
-    price_el = page.query_selector("table#offerTable tbody tr:nth-child(1) td.offers-price a span")
-    price_text = (price_el.text_content() or "").strip() if price_el else None
-    price = parse_price_text(price_text)
-
-    # Marchand (facultatif)
-    merchant_el = page.query_selector("table#offerTable tbody tr:nth-child(1) td.offers-merchant a")
-    merchant = (merchant_el.text_content() or "").strip() if merchant_el else "N/A"
+    # Prix + marchand lus en un seul aller-retour navigateur
+    data = await page.evaluate(FIRST_OFFER_JS)
+    price = parse_price_text(data["price"]) if data else None
+    merchant = data["merchant"] if data else "N/A"
 
     return price, merchant
 
-def get_goclecd_price(game_name):
+async def get_goclecd_price(context, game_name):
     """Ouvre la page de résultats, sélectionne le 1er lien via XPath, visite la page produit et lit le prix dans #offerTable."""
-    search_url = f"https://www.goclecd.fr/produits/?search_name={game_name.replace(' ', '+')}"
+    search_url = f"https://www.goclecd.fr/produits/?search_name={quote_plus(normalize_game_name(game_name))}"
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        page.goto(search_url)
-        page.wait_for_load_state("domcontentloaded")
-        accept_cookies_if_present(page)
-        page.wait_for_load_state("networkidle")
+    # Un onglet par jeu dans le contexte partagé (le navigateur reste ouvert)
+    page = await context.new_page()
+    try:
+        # Pas de "networkidle" : on attend directement les éléments utiles
+        await GOCLECD_LIMITER.wait_async()
+        await page.goto(search_url, wait_until="domcontentloaded", timeout=30000)
 
         # XPath: premier <a> dans la grille des résultats (évite les échappements CSS)
-        first_link_locator = page.locator("//div[contains(@class,'grid-view')]//div[1]/a")
+        # .first : wait_for est strict et échouerait si plusieurs liens correspondent
+        first_link = page.locator("//div[contains(@class,'grid-view')]//div[1]/a").first
         try:
-            first_link_locator.wait_for(state="attached", timeout=10000)
-        except Exception:
-            # petite attente supplémentaire pour lazy-load
-            page.wait_for_timeout(1500)
-        count = first_link_locator.count()
-        if count == 0:
-            browser.close()
+            await first_link.wait_for(state="attached", timeout=10000)
+            product_url = await first_link.get_attribute("href")
+        except PlaywrightTimeoutError:
             return None
-
-        product_url = first_link_locator.first.get_attribute("href")
         if not product_url:
-            browser.close()
             return None
 
         # Charger la page produit
-        page.goto(product_url)
-        page.wait_for_load_state("domcontentloaded")
-        accept_cookies_if_present(page)
-        page.wait_for_load_state("networkidle")
+        await GOCLECD_LIMITER.wait_async()
+        await page.goto(product_url, wait_until="domcontentloaded", timeout=30000)
 
-        # Extraire le prix + marchand dans le tableau
-        price, merchant = extract_first_offer(page)
+        # Extraire le prix + marchand dans le tableau (attend #offerTable)
+        price, merchant = await extract_first_offer(page)
 
-        result = {
+        return {
             "price": price,
             "currency": "EUR",
             "merchant": merchant if merchant else "N/A",
             "url": product_url
         }
-
-        browser.close()
-        return result
+    finally:
+        await page.close()
+
+async def get_goclecd_price_cached(context, game_name, use_cache=True):
+    """get_goclecd_price avec cache disque (seuls les prix trouvés sont mémorisés)."""
+    if not use_cache:
+        return await get_goclecd_price(context, game_name)
+    key = normalize_game_name(game_name).lower()
+    result = GOCLECD_CACHE.get(key)
+    if result is None:
+        result = await get_goclecd_price(context, game_name)
+        if result and result["price"] is not None:
+            GOCLECD_CACHE.set(key, result, expire=CACHE_EXPIRE)
+    return result
+
+async def block_unneeded_resources(route):
+    """Interrompt images, polices, CSS et traqueurs ; laisse passer le reste."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        return await route.abort()
+    if any(h in route.request.url for h in BLOCKED_HOSTS):
+        return await route.abort()
+    return await route.continue_()
+
+async def new_goclecd_context(browser):
+    """Crée un contexte navigateur pour GoCleCD (ressources lourdes bloquées)."""
+    context = await browser.new_context(
+        user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                   "(KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+        viewport={"width": 1280, "height": 800},
+    )
+    # Consentement OneTrust pré-enregistré : la bannière cookies ne s'affiche jamais
+    await context.add_cookies([{
+        "name": "OptanonAlertBoxClosed",
+        "value": datetime.now(timezone.utc).isoformat(),
+        "domain": ".goclecd.fr",
+        "path": "/",
+    }])
+    await context.route("**/*", block_unneeded_resources)
+    return context
 
 # -------------------------------
 # Comparaison
@@ -177,45 +310,127 @@ def calculate_savings(steam_price, goclecd_price):
     savings_pct = (savings_eur / steam_price) * 100
     return savings_eur, savings_pct
 
-def compare_prices_to_excel(games, output_file="comparaison_prix.xlsx"):
-    results = []
-    for app_id, name in games:
-        print(f"⏳ Traitement: {name}...")
-        steam_price = get_steam_price(app_id)
-        goclecd_data = get_goclecd_price(name)
-        goclecd_price = goclecd_data["price"] if goclecd_data else None
-        merchant = goclecd_data["merchant"] if goclecd_data else "N/A"
-        goclecd_url = goclecd_data["url"] if goclecd_data else ""
-
-        savings_eur, savings_pct = calculate_savings(steam_price, goclecd_price)
-
-        results.append({
-            "Jeu": name,
-            "Steam ID": app_id,
-            "Prix Steam (€)": steam_price if steam_price is not None else None,
-            "Prix GoCleCD (€)": goclecd_price if goclecd_price is not None else None,
-            "Marchand": merchant,
-            "Économie (€)": round(savings_eur, 2) if isinstance(savings_eur, (int, float)) else None,
-            "Économie (%)": round(savings_pct, 2) if isinstance(savings_pct, (int, float)) else None,
-            "Lien GoCleCD": goclecd_url
-        })
-
-        if savings_pct is not None:
-            print(f"✅ {name}: Steam {steam_price}€ | GoCleCD {goclecd_price}€ | Marchand: {merchant} | Économie: {savings_pct:.1f}%")
-        else:
-            print(f"✅ {name}: Données incomplètes")
-
-        time.sleep(0.4)
+# Colonnes du rapport (CSV intermédiaire + Excel)
+REPORT_FIELDS = [
+    "Jeu", "Steam ID", "Prix Steam (€)", "Prix GoCleCD (€)", "Marchand",
+    "Économie (€)", "Économie (%)", "Lien GoCleCD",
+]
+REPORT_NUMERIC_FIELDS = {"Prix Steam (€)", "Prix GoCleCD (€)", "Économie (€)", "Économie (%)"}
 
-    df = pd.DataFrame(results)
-    df_sorted = df.sort_values(by="Économie (%)", ascending=False, na_position='last')
-    df_sorted.to_excel(output_file, index=False)
+def parse_report_value(field, value):
+    """Retype une cellule relue depuis le CSV (vide -> None, nombres -> int/float)"""
+    if value == "":
+        return None
+    if field == "Steam ID":
+        return int(value)
+    if field in REPORT_NUMERIC_FIELDS:
+        return float(value)
+    return value
+
+async def process_game(contexts, steam_task, app_id, name, use_cache=True):
+    """Compare les prix Steam / GoCleCD d'un jeu et retourne la ligne du rapport.
+
+    Le prix Steam (tâche groupée partagée) et la recherche GoCleCD sont attendus
+    en parallèle ; la file de contextes limite le nombre d'onglets ouverts.
+    """
+    context = await contexts.get()
+    try:
+        print(f"⏳ Traitement: {name}...")
+        # Une erreur (timeout, réseau...) ne concerne que ce jeu : la ligne est écrite quand même
+        steam_prices, goclecd_data = await asyncio.gather(
+            asyncio.shield(steam_task), get_goclecd_price_cached(context, name, use_cache),
+            return_exceptions=True)
+    finally:
+        contexts.put_nowait(context)
+    if isinstance(steam_prices, Exception):
+        print(f"⚠️ {name}: erreur Steam ({steam_prices})")
+        steam_prices = {}
+    if isinstance(goclecd_data, Exception):
+        print(f"⚠️ {name}: erreur GoCleCD ({goclecd_data})")
+        goclecd_data = None
+    steam_price = steam_prices.get(app_id)
+    goclecd_price = goclecd_data["price"] if goclecd_data else None
+    merchant = goclecd_data["merchant"] if goclecd_data else "N/A"
+    goclecd_url = goclecd_data["url"] if goclecd_data else ""
+
+    savings_eur, savings_pct = calculate_savings(steam_price, goclecd_price)
+
+    row = {
+        "Jeu": name,
+        "Steam ID": app_id,
+        "Prix Steam (€)": steam_price if steam_price is not None else None,
+        "Prix GoCleCD (€)": goclecd_price if goclecd_price is not None else None,
+        "Marchand": merchant,
+        "Économie (€)": round(savings_eur, 2) if isinstance(savings_eur, (int, float)) else None,
+        "Économie (%)": round(savings_pct, 2) if isinstance(savings_pct, (int, float)) else None,
+        "Lien GoCleCD": goclecd_url
+    }
+
+    if savings_pct is not None:
+        print(f"✅ {name}: Steam {steam_price}€ | GoCleCD {goclecd_price}€ | Marchand: {merchant} | Économie: {savings_pct:.1f}%")
+    else:
+        print(f"✅ {name}: Données incomplètes")
+
+    return row
+
+async def compare_prices_async(games, write_row, max_workers=MAX_WORKERS, use_cache=True):
+    """Scrape GoCleCD avec un seul Chromium et un pool de contextes, pendant que les prix Steam arrivent."""
+    # Tous les prix Steam en quelques requêtes groupées, lancées en tâche de fond
+    steam_task = asyncio.create_task(
+        get_steam_prices_bulk([app_id for app_id, _ in games], use_cache=use_cache))
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            contexts = asyncio.Queue()
+            for _ in range(max(1, min(max_workers, len(games)))):
+                contexts.put_nowait(await new_goclecd_context(browser))
+
+            async def run(app_id, name):
+                write_row(await process_game(contexts, steam_task, app_id, name, use_cache))
+
+            await asyncio.gather(*(run(app_id, name) for app_id, name in games))
+        finally:
+            await browser.close()
+            await asyncio.gather(steam_task, return_exceptions=True)
+
+def compare_prices_to_excel(games, output_file="comparaison_prix.xlsx", max_workers=MAX_WORKERS, use_cache=True):
+    # Chaque ligne est écrite dans un CSV dès qu'elle est prête : mémoire bornée
+    # et résultats partiels conservés en cas d'interruption
+    csv_file = os.path.splitext(output_file)[0] + ".csv"
+    with open(csv_file, "w", newline="", encoding="utf-8") as csv_f:
+        writer = csv.DictWriter(csv_f, fieldnames=REPORT_FIELDS)
+        writer.writeheader()
+
+        def write_row(row):
+            writer.writerow(row)
+            csv_f.flush()
+
+        asyncio.run(compare_prices_async(games, write_row, max_workers, use_cache))
+
+    with open(csv_file, newline="", encoding="utf-8") as csv_f:
+        rows = [{field: parse_report_value(field, value) for field, value in row.items()}
+                for row in csv.DictReader(csv_f)]
+    rows.sort(key=lambda r: (r["Économie (%)"] is None, -(r["Économie (%)"] or 0)))
+
+    # openpyxl en écriture seule : pas de DataFrame pour quelques centaines de lignes
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Sheet1")
+    ws.append(REPORT_FIELDS)
+    for row in rows:
+        ws.append([row[field] for field in REPORT_FIELDS])
+    wb.save(output_file)
     print(f"✅ Fichier Excel créé: {output_file}")
 
 # -------------------------------
 # Main
 # -------------------------------
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Comparateur de prix Steam vs GoCleCD")
+    parser.add_argument("--no-cache", action="store_true", help="ignorer les caches disque Steam et GoCleCD")
+    args = parser.parse_args()
+    use_cache = not args.no_cache
+
     print("\n" + "="*70)
     print("💰 COMPARATEUR DE PRIX STEAM vs GOCLECD")
     print("="*70 + "\n")
@@ -223,12 +438,17 @@ if __name__ == "__main__":
     max_games_input = input("Nombre de jeux à récupérer depuis Steam: ").strip()
     max_games = int(max_games_input) if max_games_input.isdigit() else 10
 
-    games_list = get_steam_top_sellers(max_games=max_games)
-    if not games_list:
-        print("❌ Aucun jeu récupéré")
-        raise SystemExit(0)
-
-    print(f"\n🎮 Comparaison de {len(games_list)} jeux en cours...\n")
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_filename = f"comparaison_prix_{timestamp}.xlsx"
-    compare_prices_to_excel(games_list, output_filename)
+    try:
+        games_list = get_steam_top_sellers(max_games=max_games, use_cache=use_cache)
+        if not games_list:
+            print("❌ Aucun jeu récupéré")
+            raise SystemExit(0)
+
+        print(f"\n🎮 Comparaison de {len(games_list)} jeux en cours...\n")
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_filename = f"comparaison_prix_{timestamp}.xlsx"
+        compare_prices_to_excel(games_list, output_filename, use_cache=use_cache)
+    finally:
+        STEAM.close()
+        STEAM_CACHE.close()
+        GOCLECD_CACHE.close()